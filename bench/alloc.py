@@ -0,0 +1,91 @@
+"""
+Measures the memory allocated per request by the api handler using tracemalloc
+
+Run from the repository root with: python -m bench.alloc [requests]
+"""
+
+import gc
+import json
+import logging
+import sys
+import tracemalloc
+
+import structlog
+from pydantic import BaseModel
+
+from testapp.api import Api, Body
+from testapp.api.aws.awsevent import EventV1
+from testapp.api.datatypes import Response
+
+app = Api()
+
+
+class Item(BaseModel):
+    name: str
+    count: int
+
+
+@app.get("/items/{uid}")
+def get_item(uid: str, name: str):
+    return {"uid": uid, "name": name}
+
+
+@app.post("/items/{uid}")
+def post_item(uid: str, item: Item, body: Body):
+    return {"uid": uid, "count": item.count, "size": len(body.data)}
+
+
+@app.put("/items/{uid}")
+def put_item(uid: str, item: Item, response: Response):
+    response.headers = {"content-type": "application/json", "x-item": uid}
+    return item.name
+
+
+EVENTS = {
+    "GET": EventV1(
+        httpMethod="GET",
+        path="/items/abc",
+        queryStringParameters={"name": "bob"},
+        headers={"content-type": "application/json"},
+    ),
+    "POST": EventV1(
+        httpMethod="POST",
+        path="/items/abc",
+        body=json.dumps({"name": "bob", "count": 3}),
+        headers={"content-type": "application/json"},
+    ),
+    "PUT": EventV1(
+        httpMethod="PUT",
+        path="/items/abc",
+        body=json.dumps({"name": "bob", "count": 3}),
+        headers={"content-type": "application/json"},
+    ),
+}
+
+
+def measure(event: EventV1, requests: int) -> float:
+    """Returns the average peak memory allocated while handling a request"""
+    for _ in range(10):
+        app.lambda_handler(event, None)
+    gc.collect()
+    tracemalloc.start()
+    peaks = 0
+    for _ in range(requests):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        app.lambda_handler(event, None)
+        peaks += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return peaks / requests
+
+
+def main(requests: int = 1000):
+    # Logging allocates far more than the handler itself, drop it to measure the api
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+    app.freeze()
+    for method, event in EVENTS.items():
+        print(f"{method:6} peak {measure(event, requests):8.1f} B/req")
+
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:]))
@@ -1,4 +1,4 @@
-from .apihandler import Api, Body, Depends, Event, File, Headers
+from .apihandler import Api, Body, Depends, Event, File, Headers, LazyList, Router
 from .middleware import CORS_HEADERS, AuthMiddleware, CorsMiddleware
 
 __all__ = (
@@ -6,10 +6,12 @@ __all__ = (
     "CorsMiddleware",
     "AuthMiddleware",
     "Api",
+    "Router",
     "Body",
     "Event",
     "File",
     "Headers",
+    "LazyList",
     "Depends",
 )
 
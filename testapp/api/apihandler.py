@@ -1,8 +1,8 @@
 import inspect
 import re
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
-from functools import wraps
+from functools import partial, wraps
 from http import HTTPMethod, HTTPStatus
 from typing import Annotated, Any, OrderedDict, get_args, get_origin
 
@@ -10,13 +10,26 @@ from pydantic import BaseModel, ValidationError
 from structlog import get_logger
 
 from .aws.awsevent import EventV1
-from .datatypes import Body, Context, Event, File, Headers, Response
+from .body import MAX_BODY_SIZE, RequestBody
+from .datatypes import (
+    Body,
+    Context,
+    Event,
+    File,
+    Headers,
+    LazyList,
+    RequestData,
+    Response,
+    item_adapter,
+)
 from .exceptions import HttpException
 from .middleware.excep import ExceptionMiddleware
 
+logger = get_logger()
+
 
 def _populate_parameters(
-    f_sig: inspect.Signature, payload: dict, *args, **kwargs
+    f_sig: inspect.Signature, payload: RequestData, *args, **kwargs
 ) -> inspect.BoundArguments:
     """
     Populates funcion bound parameters based on the signature, and parameters passed in
@@ -30,17 +43,19 @@ def _populate_parameters(
     for field, param in f_sig.parameters.items():
         an_type = param.annotation
         if an_type == Body:
-            kwargs[field] = an_type(payload["body"])
+            kwargs[field] = an_type(payload.body.data)
         elif an_type == Context:
-            kwargs[field] = an_type(payload["context"])
+            kwargs[field] = an_type(payload.context)
         elif an_type == Event:
-            kwargs[field] = an_type(payload["event"])
+            kwargs[field] = an_type(payload.event)
         elif an_type == Headers:
-            kwargs[field] = an_type(payload["headers"])
+            kwargs[field] = an_type(payload.headers)
         elif an_type == Response:
-            kwargs[field] = payload["response"]
+            kwargs[field] = payload.get_response()
         elif inspect.isclass(an_type) and issubclass(an_type, BaseModel):
-            kwargs[field] = an_type.model_validate_json(payload["body"])
+            kwargs[field] = payload.body.model(an_type)
+        elif get_origin(an_type) == LazyList:
+            kwargs[field] = payload.body.lazy_list(get_args(an_type)[0])
         elif get_origin(an_type) == Annotated:
             anno_args = get_args(an_type)
             if type(anno_args[1]) is Depends:
@@ -56,10 +71,11 @@ def _populate_parameters(
     return bound
 
 
-class Api:
+class Router:
     @dataclass
     class ParseData:
         func: Callable
+        path: str
         url_params: tuple
         query_params: tuple
         body_params: tuple
@@ -68,6 +84,12 @@ class Api:
         f_sig: inspect.Signature
         response_status: HTTPStatus
 
+    @dataclass
+    class Mount:
+        prefix: str
+        router: "Router"
+        middleware: list[Callable]
+
     endpoints: dict[HTTPMethod, OrderedDict[str, ParseData]]
     path_to_params: OrderedDict[str, OrderedDict[HTTPMethod, ParseData]]
     regexes: dict = {
@@ -76,6 +98,8 @@ class Api:
         str: r"([^/\s]+)",
     }
     middleware: list[Callable]
+    mounts: list[Mount]
+    frozen: bool = False
 
     def __init__(self) -> None:
         self.endpoints = {
@@ -87,6 +111,20 @@ class Api:
         }
         self.path_to_params = OrderedDict([])
         self.middleware = []
+        self.mounts = []
+
+    def _check_not_frozen(self):
+        if self.frozen:
+            raise RuntimeError("Cannot modify routes or middleware once frozen")
+
+    @staticmethod
+    def _path_regex(path: str, param_types: dict) -> str:
+        """Returns the regex url matcher for a path, given the types of its url parameters"""
+        rpath = f"{path.rstrip('/')}"
+        for field in re.findall(r"(?:\{([\w-]*)\})", path):
+            if field in param_types:
+                rpath = rpath.replace(r"{{{}}}".format(field), Router.regexes[param_types[field]])
+        return f"{rpath}$"
 
     @staticmethod
     def _process_path(path: str, func: Callable) -> tuple:
@@ -98,8 +136,6 @@ class Api:
 
         Handles api dataclass and Dependeny
         """
-        rpath = f"{path.rstrip('/')}"
-
         query_params = []
         body_params = []
         depends = []
@@ -111,7 +147,6 @@ class Api:
         for field, param in f_sig.parameters.items():
             annotation = param.annotation
             if field in url_params:
-                rpath = rpath.replace(r"{{{}}}".format(field), Api.regexes[annotation])
                 param_types[field] = annotation
             elif annotation and annotation in [Body, File, Event, Context, Headers]:
                 if annotation in [Body, File]:
@@ -126,6 +161,11 @@ class Api:
             elif inspect.isclass(annotation) and issubclass(annotation, BaseModel):
                 body_params.append(field)
                 param_types[field] = annotation
+            elif get_origin(annotation) == LazyList:
+                # Build the item validator at registration rather than on first request
+                item_adapter(get_args(annotation)[0])
+                body_params.append(field)
+                param_types[field] = annotation
             elif annotation and get_origin(annotation) == Annotated:
                 anno_args = get_args(annotation)
                 if type(anno_args[1]) is Depends:
@@ -134,7 +174,7 @@ class Api:
             else:
                 query_params.append(field)
                 param_types[field] = annotation
-        rpath = f"{rpath}$"
+        rpath = Router._path_regex(path, param_types)
 
         return (
             rpath,
@@ -149,13 +189,13 @@ class Api:
     def _add_api_endpoint(
         self, method: str, path: str, func: Callable, status_code: HTTPStatus
     ) -> Callable:
-        logger = get_logger()
+        self._check_not_frozen()
         rpath, f_sig, url_params, query_params, body_params, depends, param_types = (
-            Api._process_path(path, func)
+            Router._process_path(path, func)
         )
 
         @wraps(func)
-        def call_api_endpoint(payload: dict, *args, **kwargs) -> Callable:
+        def call_api_endpoint(payload: RequestData, *args, **kwargs) -> Callable:
             try:
                 bound = _populate_parameters(f_sig, payload, *args, **kwargs)
                 return func(*bound.args, **bound.kwargs)
@@ -168,24 +208,28 @@ class Api:
                     status_code=HTTPStatus.BAD_REQUEST, body=err.__str__()
                 )
 
-        parsed_data = Api.ParseData(
+        parsed_data = Router.ParseData(
             func=call_api_endpoint,
+            path=path,
             url_params=url_params,
             query_params=query_params,
             body_params=body_params,
             depends=depends,
             param_types=param_types,
             f_sig=f_sig,
-            response_status=status_code,
+            response_status=HTTPStatus(status_code),
         )
         self.endpoints[HTTPMethod(method)][rpath] = parsed_data
-        if path not in self.path_to_params:
-            self.path_to_params[path] = OrderedDict()
-        if HTTPMethod(method) not in self.path_to_params[path]:
-            self.path_to_params[path][HTTPMethod(method)] = parsed_data
+        self._add_path_params(path, HTTPMethod(method), parsed_data)
         logger.info("Registered path", path=path, rpath=rpath)
         return call_api_endpoint
 
+    def _add_path_params(self, path: str, method: HTTPMethod, parsed_data: ParseData):
+        if path not in self.path_to_params:
+            self.path_to_params[path] = OrderedDict()
+        if method not in self.path_to_params[path]:
+            self.path_to_params[path][method] = parsed_data
+
     def get(self, path: str, status_code: HTTPStatus = HTTPStatus.OK) -> Callable:
         def deco(func: Callable) -> Callable:
             return self._add_api_endpoint(HTTPMethod.GET, path, func, status_code)
@@ -216,19 +260,194 @@ class Api:
 
         return deco
 
-    def lambda_handler(self, event, context):
-        logger = get_logger()
-        event = Api.make_event(event)
-        logger.debug(event)
+    def add_middleware(self, middleware: Callable):
+        self._check_not_frozen()
+        logger.info("Adding middleware", middleware=middleware)
+        self.middleware.append(middleware)
 
-        func = self._lambda_handler
+    def include(self, router: "Router", prefix: str, middleware: list[Callable] | None = None):
+        """
+        Mounts router under a static path prefix
+
+        The router is merged when the api is frozen, so routes, middleware and
+        routers it includes can be added until then. The router's own middleware,
+        followed by middleware, only wrap requests dispatched to this mount. Routers
+        included into router are mounted too, under the combined prefix and with the
+        combined middleware.
+
+        The prefix is a static path of letters, digits, '_' and '-' segments, and
+        every request under it is dispatched to the mount.
+        """
+        self._check_not_frozen()
+        prefix = f"/{prefix.strip('/')}"
+        if not re.fullmatch(r"(/[\w-]+)+", prefix):
+            raise ValueError(
+                "Mount prefix must be a non-empty path of letters, digits, '_' and '-', "
+                f"got {prefix!r}"
+            )
+        if router is self:
+            raise ValueError("Cannot include a router into itself")
+        if any(m.prefix == prefix for m in self.mounts):
+            raise ValueError(f"Prefix {prefix!r} is already mounted")
+
+        self.mounts.append(
+            Router.Mount(prefix=prefix, router=router, middleware=list(middleware or []))
+        )
+        logger.info("Included router", prefix=prefix, router=router)
+
+    def _flatten(
+        self, prefix: str, middleware: list[Callable]
+    ) -> Iterator[tuple[str, "Router", list, list[Callable]]]:
+        """
+        Yields the prefix, router, routes and middleware of every mount under this
+        router, with the routes' full paths and the middleware innermost first
+        """
+        for mount in self.mounts:
+            full_prefix = f"{prefix}{mount.prefix}"
+            chain = [*mount.router.middleware, *mount.middleware, *middleware]
+            routes = [
+                (method, f"{full_prefix}{parse_d.path}", parse_d)
+                for method, endpoints in mount.router.endpoints.items()
+                for parse_d in endpoints.values()
+            ]
+            yield full_prefix, mount.router, routes, chain
+            yield from mount.router._flatten(full_prefix, chain)
+
+
+class Api(Router):
+    @dataclass
+    class CompiledMount:
+        prefix: str
+        endpoints: dict[HTTPMethod, tuple[tuple[re.Pattern, Router.ParseData], ...]]
+        handler: Callable | None = None
+
+    max_body_size: int
+    _root: CompiledMount | None
+    _dispatch: dict[str, tuple[CompiledMount, ...]]
+    _handler: Callable | None
+
+    def __init__(self, max_body_size: int = MAX_BODY_SIZE) -> None:
+        super().__init__()
+        self.max_body_size = max_body_size
+        self._root = None
+        self._dispatch = {}
+        self._handler = None
+
+    def freeze(self):
+        """
+        Merges the api's own routes and all mounted routers into a single dispatch
+        structure, and builds the middleware chains once instead of per request
+
+        Mounts are keyed by the first segment of their prefix, so finding the mount
+        for a request is a single dictionary lookup. Routes and middleware can't be
+        added once frozen. Called on the first request if not called explicitly.
+
+        Raises ValueError if one of the api's own routes, static or with url
+        parameters, can match paths under a mount prefix, as all requests under a
+        prefix are dispatched to its mount. Included routers are frozen too.
+        """
+        if self.frozen:
+            return
+
+        def compile_mount(prefix, routes, middleware) -> Api.CompiledMount:
+            endpoints: dict[HTTPMethod, list] = {}
+            for method, rpath, parse_d in routes:
+                endpoints.setdefault(method, []).append((re.compile(rpath), parse_d))
+            mount = Api.CompiledMount(
+                prefix=prefix, endpoints={k: tuple(v) for k, v in endpoints.items()}
+            )
+            func = partial(self._handle_event, mount)
+            for f in middleware:
+                func = f(func)
+            mount.handler = func
+            return mount
+
+        self._root = compile_mount(
+            "",
+            [
+                (method, rpath, parse_d)
+                for method, endpoints in self.endpoints.items()
+                for rpath, parse_d in endpoints.items()
+            ],
+            [],
+        )
+        mounts = list(self._flatten("", []))
+        prefixes = [prefix for prefix, *_ in mounts]
+        if duplicates := {p for p in prefixes if prefixes.count(p) > 1}:
+            raise ValueError(f"Prefixes {sorted(duplicates)} are mounted more than once")
+        for endpoints in self.endpoints.values():
+            for parse_d in endpoints.values():
+                for prefix in prefixes:
+                    if Api._hidden_by_prefix(parse_d, prefix):
+                        raise ValueError(
+                            f"Route {parse_d.path!r} is hidden by the router mounted at "
+                            f"{prefix!r}, register it on that router instead"
+                        )
+
+        dispatch: dict[str, list[Api.CompiledMount]] = {}
+        for prefix, router, routes, middleware in mounts:
+            for method, path, parse_d in routes:
+                self._add_path_params(path, method, parse_d)
+            routes = [
+                (method, Router._path_regex(path, pd.param_types), pd)
+                for method, path, pd in routes
+            ]
+            mount = compile_mount(prefix, routes, middleware)
+            dispatch.setdefault(Api._first_segment(prefix), []).append(mount)
+            # Anything registered on the router from now on would never be dispatched
+            router.frozen = True
+        # Nested mounts share a first segment, the longest prefix has to be tried first
+        self._dispatch = {
+            k: tuple(sorted(v, key=lambda m: len(m.prefix), reverse=True))
+            for k, v in dispatch.items()
+        }
 
+        func = self._lambda_handler
         for f in self.middleware:
             func = f(func)
         logger.info("Adding ExceptionMiddleware")
-        func = ExceptionMiddleware(func)
+        self._handler = ExceptionMiddleware(func)
+        self.frozen = True
+        logger.info("Api frozen", mounts=len(mounts))
 
-        return func(event, context)
+    @staticmethod
+    def _hidden_by_prefix(parse_d: Router.ParseData, prefix: str) -> bool:
+        """Whether a route can match paths under prefix, segment by segment"""
+        segments = parse_d.path.strip("/").split("/")
+        prefix_segments = prefix.strip("/").split("/")
+        if len(segments) < len(prefix_segments):
+            return False
+        for segment, prefix_segment in zip(segments, prefix_segments):
+            field = re.fullmatch(r"\{([\w-]*)\}", segment)
+            if field and field.group(1) in parse_d.param_types:
+                regex = Router.regexes[parse_d.param_types[field.group(1)]]
+                if not re.fullmatch(regex, prefix_segment):
+                    return False
+            elif segment != prefix_segment:
+                return False
+        return True
+
+    @staticmethod
+    def _first_segment(path: str) -> str:
+        return path.lstrip("/").partition("/")[0]
+
+    def _lookup_mount(self, path: str) -> CompiledMount | None:
+        path = path.rstrip("/")
+        for mount in self._dispatch.get(Api._first_segment(path), ()):
+            if path == mount.prefix or path.startswith(f"{mount.prefix}/"):
+                return mount
+        return None
+
+    def _find_mount(self, full_path: str | None) -> CompiledMount:
+        self.freeze()
+        return self._lookup_mount(full_path or "") or self._root
+
+    def lambda_handler(self, event, context):
+        event = Api.make_event(event)
+        logger.debug(event)
+
+        self.freeze()
+        return self._handler(event, context)
 
     @staticmethod
     def make_event(event) -> EventV1:
@@ -247,7 +466,10 @@ class Api:
             raise HttpException(status_code=HTTPStatus.BAD_REQUEST, body=e) from e
 
     def _lambda_handler(self, event, context) -> Response:
-        logger = get_logger()
+        mount = self._find_mount(event.path)
+        return mount.handler(event, context)
+
+    def _handle_event(self, mount: CompiledMount, event, context) -> Response:
         params, raw_path, method, content, headers = Api.parse_event(event)
 
         logger.info(
@@ -258,7 +480,8 @@ class Api:
             Context=context,
         )
 
-        return self.handler(
+        return self._handle(
+            mount,
             method=method,
             full_path=raw_path,
             query_params=params,
@@ -266,13 +489,9 @@ class Api:
             context=context,
             body=content,
             headers=headers,
+            is_base64_encoded=event.isBase64Encoded,
         )
 
-    def add_middleware(self, middleware: Callable):
-        logger = get_logger()
-        logger.info("Adding middleware", middleware=middleware)
-        self.middleware.append(middleware)
-
     def handler(
         self,
         method: str,
@@ -283,12 +502,36 @@ class Api:
         context: Any,
         body: Any,
         headers: dict,
+        is_base64_encoded: bool = False,
+    ) -> Response:
+        """Routes a request to its endpoint, without running any middleware"""
+        return self._handle(
+            self._find_mount(full_path),
+            method,
+            full_path,
+            query_params=query_params,
+            event=event,
+            context=context,
+            body=body,
+            headers=headers,
+            is_base64_encoded=is_base64_encoded,
+        )
+
+    def _handle(
+        self,
+        mount: CompiledMount,
+        method: str,
+        full_path: str,
+        *,
+        query_params: dict,
+        event: EventV1,
+        context: Any,
+        body: Any,
+        headers: dict,
+        is_base64_encoded: bool = False,
     ) -> Response:
-        logger = get_logger()
-        if not query_params:
-            query_params = {}
-        for rpath, parse_d in self.endpoints[HTTPMethod(method)].items():
-            if values := re.match(rpath, full_path.rstrip("/")):
+        for pattern, parse_d in mount.endpoints.get(method, ()):
+            if values := pattern.match(full_path.rstrip("/")):
                 logger.info(
                     "Handler",
                     method=method,
@@ -296,8 +539,7 @@ class Api:
                     query_params=query_params,
                     body=body,
                 )
-                logger.info("Found path", ep_path=rpath)
-                response = Response(statusCode=parse_d.response_status)
+                logger.info("Found path", ep_path=pattern.pattern)
                 params = {}
                 for i, j in zip(parse_d.url_params, values.groups()):
                     if param := parse_d.f_sig.parameters.get(i):
@@ -305,21 +547,28 @@ class Api:
                     else:
                         logger.info("unknown param", param=i)
 
-                for i, j in query_params.items():
-                    if param := parse_d.f_sig.parameters.get(i):
-                        params[i] = param.annotation(j)
-                    else:
-                        logger.info("unknown param", param=i)
-
-                payload = {
-                    "event": event,
-                    "context": context,
-                    "body": body,
-                    "headers": headers,
-                    "response": response,
-                }
+                if query_params:
+                    for i, j in query_params.items():
+                        if param := parse_d.f_sig.parameters.get(i):
+                            params[i] = param.annotation(j)
+                        else:
+                            logger.info("unknown param", param=i)
+
+                payload = RequestData(
+                    event=event,
+                    context=context,
+                    body=RequestBody(
+                        body,
+                        is_base64_encoded=is_base64_encoded,
+                        headers=headers,
+                        max_size=self.max_body_size,
+                    ),
+                    headers=headers,
+                    response_status=parse_d.response_status,
+                )
 
                 body = parse_d.func(payload, **params)
+                response = payload.get_response()
                 if body:
                     response.body = body
                 return response
@@ -0,0 +1,177 @@
+import base64
+import binascii
+from http import HTTPStatus
+from typing import Any
+
+from pydantic import BaseModel
+from pydantic_core import from_json
+
+from .datatypes import LazyList
+from .exceptions import HttpException
+
+MAX_BODY_SIZE = 6 * 1024 * 1024  # Lambda synchronous invocation payload limit
+
+_MISSING = object()
+
+
+def _charset(headers: dict | None) -> str:
+    """Returns the charset declared in the content-type header, defaulting to utf-8"""
+    if headers:
+        for k, v in headers.items():
+            if k.lower() == "content-type" and v:
+                for part in v.split(";")[1:]:
+                    name, _, value = part.strip().partition("=")
+                    if name.lower() == "charset" and value:
+                        return value.strip('"')
+    return "utf-8"
+
+
+class RequestBody:
+    """
+    Decodes the request body once per request and caches the results
+
+    The raw event body is size checked before decoding, base64 decoded if flagged
+    by the event and decoded using the charset from the content-type header. The
+    decoded text, the parsed JSON and every model validated from the body are
+    cached, so parameters and dependencies sharing the same body don't decode or
+    validate it twice.
+    """
+
+    __slots__ = (
+        "raw",
+        "is_base64_encoded",
+        "headers",
+        "_bytes",
+        "_text",
+        "_json",
+        "_models",
+        "_lazy_lists",
+    )
+
+    def __init__(
+        self,
+        raw: Any,
+        *,
+        is_base64_encoded: bool = False,
+        headers: dict | None = None,
+        max_size: int = MAX_BODY_SIZE,
+    ):
+        self.raw = raw
+        self.is_base64_encoded = is_base64_encoded
+        self.headers = headers
+        self._bytes: bytes | None = None
+        self._text: str | None = None
+        self._json: Any = _MISSING
+        self._models: dict[type, BaseModel] = {}
+        self._lazy_lists: dict[Any, LazyList] = {}
+        self._check_size(max_size)
+
+    def _check_size(self, max_size: int):
+        if self.raw is None or not isinstance(self.raw, str | bytes):
+            return
+        size = len(self.raw)
+        if self.is_base64_encoded:
+            size = size * 3 // 4
+        if size > max_size:
+            raise HttpException(
+                status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                body=f"Body of {size} bytes exceeds limit of {max_size} bytes",
+            )
+
+    @property
+    def bytes(self) -> bytes:
+        if self._bytes is None:
+            raw = self.raw
+            if raw is None:
+                self._bytes = b""
+            elif self.is_base64_encoded:
+                try:
+                    self._bytes = base64.b64decode(raw, validate=True)
+                except (binascii.Error, ValueError) as err:
+                    raise HttpException(
+                        status_code=HTTPStatus.BAD_REQUEST, body=err.__str__()
+                    ) from err
+            elif isinstance(raw, bytes):
+                self._bytes = raw
+            else:
+                self._bytes = str(raw).encode("utf-8")
+        return self._bytes
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            if isinstance(self.raw, str) and not self.is_base64_encoded:
+                self._text = self.raw
+            else:
+                try:
+                    self._text = self.bytes.decode(_charset(self.headers))
+                except (UnicodeDecodeError, LookupError) as err:
+                    raise HttpException(
+                        status_code=HTTPStatus.BAD_REQUEST, body=err.__str__()
+                    ) from err
+        return self._text
+
+    @property
+    def data(self) -> Any:
+        """
+        The body as passed to Body parameters: text if it decodes, otherwise bytes
+
+        Bodies that aren't str or bytes, e.g. when calling Api.handler directly, and
+        missing bodies are passed through unchanged.
+        """
+        raw = self.raw
+        if not isinstance(raw, str | bytes):
+            return raw
+        if isinstance(raw, str) and not self.is_base64_encoded:
+            return raw
+        try:
+            return self.text
+        except HttpException:
+            # Binary upload, the bytes property still raises for invalid base64
+            return self.bytes
+
+    def json(self) -> Any:
+        if self._json is _MISSING:
+            if self.raw is not None and not isinstance(self.raw, str | bytes):
+                # Already decoded, e.g. when calling Api.handler directly
+                self._json = self.raw
+            else:
+                try:
+                    self._json = from_json(self.text)
+                except ValueError as err:
+                    raise HttpException(
+                        status_code=HTTPStatus.BAD_REQUEST, body=err.__str__()
+                    ) from err
+        return self._json
+
+    def model(self, model: type[BaseModel]) -> BaseModel:
+        """
+        Validates the body as the given model, reusing any previous instance
+
+        Bodies are validated with the model's JSON mode rules, unless they were
+        already decoded, e.g. when calling Api.handler directly.
+        """
+        if (instance := self._models.get(model)) is None:
+            if isinstance(self.raw, str | bytes):
+                instance = model.model_validate_json(self.text)
+            else:
+                instance = model.model_validate(self.raw)
+            self._models[model] = instance
+        return instance
+
+    def lazy_list(self, item_type: Any) -> LazyList:
+        """
+        Wraps a JSON array body so that items are validated on access
+
+        The array is parsed once, so its items are validated with python mode rules,
+        see LazyList.
+        """
+        if (lazy := self._lazy_lists.get(item_type)) is None:
+            data = self.json()
+            if not isinstance(data, list):
+                raise HttpException(
+                    status_code=HTTPStatus.BAD_REQUEST, body="Expected a JSON array body"
+                )
+            lazy = LazyList(data, item_type)
+            self._lazy_lists[item_type] = lazy
+        return lazy
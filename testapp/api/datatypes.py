@@ -1,12 +1,18 @@
+from collections.abc import Iterator, Sequence
+from functools import lru_cache
 from http import HTTPStatus
-from typing import Any
+from typing import TYPE_CHECKING, Any, Generic, TypeVar, overload
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
 
 from .aws.awsevent import EventV1
 
+if TYPE_CHECKING:
+    from .body import RequestBody
+
 
 class Context:
+    __slots__ = ("data",)
     data: Any
 
     def __init__(self, data: Any):
@@ -20,11 +26,49 @@ class Response(BaseModel):
     isBase64Encoded: bool = False
 
 
+class RequestData:
+    """
+    Slotted per request state passed to endpoints and dependencies
+
+    The Response is created without validation the first time an endpoint or
+    dependency asks for it, or once the endpoint returns.
+    """
+
+    __slots__ = ("event", "context", "body", "headers", "response_status", "response")
+    event: EventV1
+    context: Any
+    body: "RequestBody"
+    headers: dict | None
+    response_status: HTTPStatus
+    response: Response | None
+
+    def __init__(
+        self,
+        event: EventV1,
+        context: Any,
+        body: "RequestBody",
+        headers: dict | None,
+        response_status: HTTPStatus,
+    ):
+        self.event = event
+        self.context = context
+        self.body = body
+        self.headers = headers
+        self.response_status = response_status
+        self.response = None
+
+    def get_response(self) -> Response:
+        if self.response is None:
+            self.response = Response.model_construct(statusCode=self.response_status)
+        return self.response
+
+
 class Event(BaseModel):
     event: EventV1
 
 
 class Body:
+    __slots__ = ("data",)
     data: Any
 
     def __init__(self, data: Any):
@@ -32,8 +76,59 @@ class Body:
 
 
 class Headers(dict):
-    pass
+    __slots__ = ()
 
 
 class File(BaseModel):
     filename: str
+
+
+T = TypeVar("T")
+
+
+@lru_cache
+def item_adapter(item_type: Any) -> TypeAdapter:
+    return TypeAdapter(item_type)
+
+
+class LazyList(Sequence[T], Generic[T]):
+    """
+    A JSON array body whose items are only validated when accessed
+
+    Annotate a parameter with LazyList[Model] to avoid validating every item of
+    a large array payload up front. Validated items are kept, so each item is
+    validated at most once. Items are validated from the parsed JSON with python
+    mode rules, so strict models need e.g. datetime and UUID fields to allow
+    string input.
+    """
+
+    __slots__ = ("data", "_adapter", "_items")
+
+    def __init__(self, data: list, item_type: Any):
+        self.data = data
+        self._adapter = item_adapter(item_type)
+        self._items: dict[int, T] = {}
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.data)))]
+        if index < 0:
+            index += len(self.data)
+            if index < 0:
+                raise IndexError("LazyList index out of range")
+        if index not in self._items:
+            self._items[index] = self._adapter.validate_python(self.data[index])
+        return self._items[index]
+
+    def __iter__(self) -> Iterator[T]:
+        for i in range(len(self.data)):
+            yield self[i]
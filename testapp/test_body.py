@@ -0,0 +1,127 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+from http import HTTPStatus
+from typing import Annotated
+
+import pytest
+from pydantic import BaseModel, ConfigDict
+
+from testapp.api import Api, Body, Depends, LazyList
+from testapp.api.body import RequestBody
+from testapp.api.exceptions import HttpException
+
+
+class Item(BaseModel):
+    name: str
+
+
+def call(app: Api, method: str, path: str, body, **kwargs):
+    return app.handler(
+        method,
+        path,
+        query_params={},
+        event=None,
+        context=None,
+        body=body,
+        headers=kwargs.pop("headers", {}),
+        **kwargs,
+    )
+
+
+def test_model_validated_once_for_params_and_dependencies():
+    app = Api()
+    seen = []
+
+    def dep(item: Item):
+        seen.append(item)
+        return item
+
+    @app.post("/items")
+    def post_item(item: Item, other: Item, d: Annotated[Item, Depends(dep)]):
+        seen.extend([item, other])
+        return item.name
+
+    response = call(app, "POST", "/items", json.dumps({"name": "bob"}))
+    assert response.body == "bob"
+    assert len(seen) == 3
+    assert seen[0] is seen[1] is seen[2]
+
+
+def test_strict_model_uses_json_rules():
+    class Event(BaseModel):
+        model_config = ConfigDict(strict=True)
+        when: datetime
+        id: UUID
+
+    app = Api()
+
+    @app.post("/events")
+    def post_event(event: Event):
+        return [event.when.year, event.id.version]
+
+    body = json.dumps({"when": "2024-01-01T00:00:00", "id": "1b4e28ba-2fa1-41d2-883f-0016d3cca427"})
+    response = call(app, "POST", "/events", body)
+    assert response.body == [2024, 4]
+
+
+def test_base64_and_charset():
+    app = Api()
+
+    @app.post("/text")
+    def post_text(body: Body):
+        return body.data
+
+    raw = base64.b64encode("héllo".encode("latin-1")).decode()
+    response = call(
+        app,
+        "POST",
+        "/text",
+        raw,
+        headers={"Content-Type": "text/plain; charset=latin-1"},
+        is_base64_encoded=True,
+    )
+    assert response.body == "héllo"
+
+
+def test_body_binary_and_raw_values():
+    app = Api()
+
+    @app.post("/upload")
+    def upload(body: Body):
+        return [type(body.data).__name__, len(body.data) if body.data else body.data]
+
+    png = b"\x89PNG\r\n\x1a\n\x00\xff"
+    response = call(app, "POST", "/upload", base64.b64encode(png).decode(), is_base64_encoded=True)
+    assert response.body == ["bytes", len(png)]
+
+    response = call(app, "POST", "/upload", {"a": 1})
+    assert response.body == ["dict", 1]
+
+    response = call(app, "POST", "/upload", None)
+    assert response.body == ["NoneType", None]
+
+
+def test_body_size_limit():
+    with pytest.raises(HttpException) as err:
+        RequestBody("x" * 11, max_size=10)
+    assert err.value.status_code == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+
+
+def test_lazy_list_validates_on_access():
+    app = Api()
+
+    @app.post("/items/bulk")
+    def post_items(items: LazyList[Item]):
+        with pytest.raises(IndexError):
+            items[-3]
+        return [len(items), items[0].name]
+
+    body = json.dumps([{"name": "a"}, {"invalid": True}])
+    response = call(app, "POST", "/items/bulk", body)
+    assert response.body == [2, "a"]
+
+    with pytest.raises(HttpException) as err:
+        call(app, "POST", "/items/bulk", json.dumps({"name": "a"}))
+    assert err.value.status_code == HTTPStatus.BAD_REQUEST
@@ -0,0 +1,62 @@
+from http import HTTPStatus
+
+from testapp.api import Api
+from testapp.api.aws.awsevent import EventV1
+from testapp.api.datatypes import Response
+from testapp.api.middleware.cors import CorsMiddleware
+
+
+def test_handler_always_returns_response():
+    app = Api()
+    app.add_middleware(CorsMiddleware)
+
+    @app.get("/plain")
+    def plain():
+        return "plain"
+
+    @app.get("/custom")
+    def custom(response: Response):
+        response.statusCode = HTTPStatus.ACCEPTED
+        response.headers["x-custom"] = "1"
+        return "custom"
+
+    headers = {"origin": "http://localhost:3001"}
+    plain_resp = app.lambda_handler(EventV1(httpMethod="GET", path="/plain", headers=headers), None)
+    assert type(plain_resp) is Response
+    assert plain_resp.body == "plain"
+    assert plain_resp.headers["Access-Control-Allow-Origin"] == "http://localhost:3001"
+
+    custom_resp = app.lambda_handler(
+        EventV1(httpMethod="GET", path="/custom", headers=headers), None
+    )
+    assert type(custom_resp) is Response
+    assert custom_resp.statusCode == HTTPStatus.ACCEPTED
+    assert custom_resp.body == "custom"
+    assert custom_resp.headers["x-custom"] == "1"
+
+    # Each response gets its own default headers
+    assert "x-custom" not in Response.model_construct().headers
+
+
+def test_int_status_code_and_header_mutating_middleware():
+    app = Api()
+
+    class HeaderMiddleware:
+        def __init__(self, next):
+            self.next = next
+
+        def __call__(self, event, context):
+            response = self.next(event, context)
+            response.headers["x-middleware"] = "1"
+            return response
+
+    app.add_middleware(HeaderMiddleware)
+
+    @app.get("/created", status_code=201)
+    def created():
+        return "created"
+
+    response = app.lambda_handler(EventV1(httpMethod="GET", path="/created"), None)
+    assert response.statusCode == HTTPStatus.CREATED
+    assert response.headers["x-middleware"] == "1"
+    assert response.model_dump(mode="json")["statusCode"] == 201
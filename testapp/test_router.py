@@ -0,0 +1,139 @@
+from http import HTTPStatus
+
+import pytest
+
+from testapp.api import Api, Router
+from testapp.api.aws.awsevent import EventV1
+
+
+def event(method: str, path: str) -> dict:
+    return EventV1(httpMethod=method, path=path).model_dump()
+
+
+def tagging(tag: str, calls: list):
+    class TagMiddleware:
+        def __init__(self, next):
+            self.next = next
+
+        def __call__(self, event, context):
+            calls.append(tag)
+            return self.next(event, context)
+
+    return TagMiddleware
+
+
+def make_app(calls: list) -> Api:
+    app = Api()
+
+    @app.get("/health")
+    def health():
+        return "ok"
+
+    users = Router()
+    users.add_middleware(tagging("users-own", calls))
+
+    @users.get("/{uid}")
+    def get_user(uid: int):
+        return {"user": uid}
+
+    admin = Router()
+
+    @admin.get("/stats")
+    def stats():
+        return "stats"
+
+    users.include(admin, prefix="/admin", middleware=[tagging("admin", calls)])
+    app.include(users, prefix="/users", middleware=[tagging("users", calls)])
+    return app
+
+
+def test_mounted_routes_are_dispatched_with_mount_middleware():
+    calls = []
+    app = make_app(calls)
+
+    response = app.lambda_handler(event("GET", "/users/3"), None)
+    assert response.body == {"user": 3}
+    assert calls == ["users", "users-own"]
+
+    calls.clear()
+    response = app.lambda_handler(event("GET", "/users/admin/stats"), None)
+    assert response.body == "stats"
+    assert calls == ["users", "users-own", "admin"]
+
+    calls.clear()
+    response = app.lambda_handler(event("GET", "/health"), None)
+    assert response.body == "ok"
+    assert calls == []
+
+
+def test_unknown_path_within_mount():
+    app = make_app([])
+    response = app.lambda_handler(event("GET", "/users/abc"), None)
+    assert response.statusCode == HTTPStatus.NOT_FOUND
+
+
+def test_mounted_routes_listed_in_path_to_params():
+    app = make_app([])
+    app.freeze()
+    assert list(app.path_to_params) == ["/health", "/users/{uid}", "/users/admin/stats"]
+
+
+def test_include_validation_and_freeze():
+    app = Api()
+    app.include(Router(), prefix="/a")
+    with pytest.raises(ValueError):
+        app.include(Router(), prefix="a/")
+    with pytest.raises(ValueError):
+        app.include(Router(), prefix="/")
+    with pytest.raises(ValueError):
+        app.include(Router(), prefix="/v1.0")
+    with pytest.raises(ValueError):
+        app.include(Router(), prefix="/{tenant}")
+
+    app.freeze()
+    with pytest.raises(RuntimeError):
+        app.include(Router(), prefix="/b")
+
+
+def test_root_route_hidden_by_mount_is_rejected():
+    app = Api()
+
+    @app.get("/users/me")
+    def me():
+        return "me"
+
+    app.include(Router(), prefix="/users")
+    with pytest.raises(ValueError, match="/users/me"):
+        app.freeze()
+
+
+def test_root_route_with_url_param_hidden_by_mount_is_rejected():
+    app = Api()
+
+    @app.get("/{name}")
+    def by_name(name: str):
+        return name
+
+    @app.get("/{uid}/profile")
+    def profile(uid: int):
+        return uid
+
+    app.include(Router(), prefix="/users")
+    with pytest.raises(ValueError, match="/{name}"):
+        app.freeze()
+
+
+def test_router_merged_at_freeze():
+    app = Api()
+    router = Router()
+    app.include(router, prefix="/r")
+
+    @router.get("/x")
+    def x():
+        return "x"
+
+    response = app.lambda_handler(event("GET", "/r/x"), None)
+    assert response.body == "x"
+    assert "/r/x" in app.path_to_params
+    with pytest.raises(RuntimeError):
+        router.get("/y")(x)